@@ -11,8 +11,11 @@ import numpy as np
 import threading
 import time
 import json
+import logging
+import math
 import os
-from collections import deque
+
+logger = logging.getLogger(__name__)
 
 
 class SimplexRepeater:
@@ -23,27 +26,62 @@ class SimplexRepeater:
         
         # Audio-Parameter
         self.CHUNK = 1024
+        self.READ_CHUNKS = 4  # Blöcke pro PortAudio-Lesezugriff während der Aufnahme
+        self.WRITE_CHUNKS = 4  # Blöcke pro Wiedergabe-Callback
         self.FORMAT = pyaudio.paInt16
         self.CHANNELS = 1
         self.RATE = 44100
+        self.MAX_RECORD_TIME = 120.0  # Obergrenze des Aufnahmezeit-Reglers in Sekunden
+        
+        # Vorallozierter Arbeitspuffer für die Pegelberechnung (wird pro Lesezugriff wiederverwendet)
+        self._level_buf = np.empty((self.READ_CHUNKS, self.CHUNK), dtype=np.float32)
+        # Arbeitspuffer für die Verstärkung, die Aufnahme wird blockweise durchlaufen
+        self._gain_buf = np.empty(self.CHUNK * 64, dtype=np.float32)
         
         # Konfigurationsdatei
         self.config_file = os.path.join(os.path.expanduser("~"), ".simplex_repeater_config.json")
+        self.last_saved_config = None  # Zuletzt geschriebene Konfiguration
+        self.save_pending = False  # Verzögertes Speichern bereits geplant
+        self.SAVE_DELAY_MS = 500  # Reglerbewegungen werden gesammelt gespeichert
         
         # Status
         self.running = False
         self.is_recording = False
         self.is_playing = False
-        self.audio_buffer = deque()
+        # Aufnahmepuffer wird bei Bedarf vergrößert und danach wiederverwendet
+        self.audio_buffer = np.zeros(0, dtype=np.int16)
+        self.audio_buffer_len = 0  # Anzahl der aufgenommenen Samples
         self.dead_time_end = 0  # Zeitpunkt wenn Totzeit endet
         self.current_damped_level = 0  # Aktueller gedämpfter Pegel
-        self.last_update_time = time.time()  # Zeitpunkt der letzten Pegel-Aktualisierung
-        
-        # Streams für dynamisches Umschalten
-        self.stream_in = None
-        self.stream_out = None
-        self.streams_lock = threading.Lock()  # Lock für Thread-Sicherheit
+        self.current_progress = 0.0  # Aktueller Fortschritt in Prozent (vom Audio-Thread gesetzt)
+        self.last_progress = -1.0  # Zuletzt angezeigter Fortschritt
+        self.current_status = None  # Aktueller Status (Text, Farbe), vom Audio-Thread gesetzt
+        self.last_status = None  # Zuletzt angezeigter Status
+        self.GUI_UPDATE_INTERVAL = 0.04  # Pegel- und Fortschrittsanzeige 25x pro Sekunde
+        self.canvas_width = 1  # Zwischengespeicherte Canvas-Breite (aktualisiert bei <Configure>)
+        self.resize_after_id = None  # Geplante Neuzeichnung nach Größenänderung
+        self.RESIZE_DELAY_MS = 120  # Schwellwert-Linien erst nach Ende der Größenänderung neu setzen
+        self.last_bar_px = -1  # Zuletzt gezeichnete Balkenbreite in Pixeln
+        self.last_threshold_lines = None  # Zuletzt gezeichnete (Startpegel, Stoppegel, Breite)
+        self.pending_labels = {}  # Label -> Text, gesetzt im nächsten Idle-Durchlauf
+        self.label_flush_pending = False
+        self.threshold_lines_pending = False  # Verschieben der Schwellwert-Linien geplant
+        
+        # Geräteumschaltung: GUI setzt nur das Flag, der Audio-Thread öffnet die Streams
+        # selbst neu (Attributzuweisung ist unter dem GIL atomar, kein Lock nötig)
         self.restart_streams_flag = False  # Flag für Stream-Neustart
+        # Geräte-IDs der aktuellen Auswahl, damit der Audio-Thread keine Tk-Variablen liest
+        self.input_devices = {}
+        self.output_devices = {}
+        self.input_device = None
+        self.output_device = None
+        
+        # Monitoring im PortAudio-Callback: meldet das Überschreiten des Startpegels
+        self.trigger_event = threading.Event()
+        # Weckt den Audio-Thread bei Stop/Geräteänderung sofort aus Wartezeiten
+        self.wake_event = threading.Event()
+        # Wird beim Stoppen gesetzt und beendet das Warten auf das Wiedergabe-Ende sofort
+        self.stop_event = threading.Event()
         
         # PyAudio Initialisierung
         self.p = pyaudio.PyAudio()
@@ -57,8 +95,12 @@ class SimplexRepeater:
         # Konfiguration laden
         self.load_config()
         
+        # Pegel- und Fortschrittsanzeige periodisch aktualisieren
+        self.refresh_display()
+        
         # Thread für Audio-Verarbeitung
         self.audio_thread = None
+        self.shutdown_deadline = None  # Gesetzt sobald das Fenster geschlossen wird
         
     def create_gui(self):
 
@@ -93,6 +135,7 @@ class SimplexRepeater:
         self.threshold_label = ttk.Label(threshold_frame, text="1000")
         self.threshold_label.pack(side=tk.LEFT, padx=5)
         self.start_threshold_var.trace('w', self.update_threshold_label)
+        self.start_threshold = self.start_threshold_var.get()
         
         # Abbruch-Pegel-Einstellung (Stop Threshold)
         row += 1 
@@ -107,6 +150,7 @@ class SimplexRepeater:
         self.stop_threshold_label = ttk.Label(stop_threshold_frame, text="100")
         self.stop_threshold_label.pack(side=tk.LEFT, padx=5)
         self.stop_threshold_var.trace('w', self.update_stop_threshold_label)
+        self.stop_threshold = self.stop_threshold_var.get()
         
         # Canvas für Pegelanzeige
         row += 1 
@@ -114,10 +158,14 @@ class SimplexRepeater:
                                       highlightthickness=1, highlightbackground='gray')
         self.level_canvas.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5, padx=5)
         
-        # Elemente für Level-Anzeige
-        self.level_bar = None
-        self.threshold_line = None
-        self.stop_threshold_line = None
+        # Elemente für Level-Anzeige einmalig anlegen, danach nur per coords() verschieben
+        # (Erstellungsreihenfolge = Stapelreihenfolge: Balken unter den Linien)
+        self.level_bar = self.level_canvas.create_rectangle(
+            0, 0, 0, 40, fill='lightgray', outline='', tags='level')
+        self.threshold_line = self.level_canvas.create_line(
+            0, 1, 0, 41, fill='red', width=4, tags='start_threshold')
+        self.stop_threshold_line = self.level_canvas.create_line(
+            0, 1, 0, 41, fill='green', width=4, tags='stop_threshold')
 
         # Titel Pegeldämpfung
         row += 1 
@@ -137,6 +185,7 @@ class SimplexRepeater:
         self.rise_time_label = ttk.Label(rise_time_frame, text="Aus")
         self.rise_time_label.pack(side=tk.LEFT, padx=5)
         self.rise_time_var.trace('w', self.update_rise_time_label)
+        self.rise_coefficient = self.envelope_coefficient(self.rise_time_var.get())
         
         # Abfalldämpfung-Einstellung (Release in ms)
         row += 1 
@@ -151,6 +200,7 @@ class SimplexRepeater:
         self.fall_time_label = ttk.Label(fall_time_frame, text="100.0 ms")
         self.fall_time_label.pack(side=tk.LEFT, padx=5)
         self.fall_time_var.trace('w', self.update_fall_time_label)
+        self.fall_coefficient = self.envelope_coefficient(self.fall_time_var.get())
 
         # Titel Zeiteinstellungen
         row += 1 
@@ -164,12 +214,13 @@ class SimplexRepeater:
         record_frame = ttk.Frame(main_frame)
         record_frame.grid(row=row, column=1, sticky=(tk.W, tk.E), pady=5)
         self.record_time_var = tk.DoubleVar(value=30.0)
-        self.record_time_scale = ttk.Scale(record_frame, from_=1.0, to=120.0,
+        self.record_time_scale = ttk.Scale(record_frame, from_=1.0, to=self.MAX_RECORD_TIME,
                                           variable=self.record_time_var, orient=tk.HORIZONTAL)
         self.record_time_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
         self.record_time_label = ttk.Label(record_frame, text="30.0s")
         self.record_time_label.pack(side=tk.LEFT, padx=5)
         self.record_time_var.trace('w', self.update_record_time_label)
+        self.record_time = self.record_time_var.get()
         
         # Abbruch-Zeit-Einstellung
         row += 1 
@@ -184,6 +235,7 @@ class SimplexRepeater:
         self.stop_time_label = ttk.Label(stop_time_frame, text="0.5s")
         self.stop_time_label.pack(side=tk.LEFT, padx=5)
         self.stop_time_var.trace('w', self.update_stop_time_label)
+        self.stop_time = self.stop_time_var.get()
         
         # Totzeit-Einstellung
         row += 1 
@@ -198,6 +250,7 @@ class SimplexRepeater:
         self.dead_time_label = ttk.Label(dead_time_frame, text="2.0s")
         self.dead_time_label.pack(side=tk.LEFT, padx=5)
         self.dead_time_var.trace('w', self.update_dead_time_label)
+        self.dead_time = self.dead_time_var.get()
 
         # Titel Audioeinstellungen
         row += 1 
@@ -213,6 +266,7 @@ class SimplexRepeater:
                                               state='readonly', width=30)
         self.input_device_combo.grid(row=row, column=1, sticky=(tk.W, tk.E), pady=5)
         self.input_device_combo.bind('<<ComboboxSelected>>', self.on_input_device_changed)
+        self.input_device_var.trace('w', self.update_selected_devices)
         
         # Audio-Ausgabe Auswahl
         row += 1 
@@ -223,6 +277,7 @@ class SimplexRepeater:
                                                state='readonly', width=30)
         self.output_device_combo.grid(row=row, column=1, sticky=(tk.W, tk.E), pady=5)
         self.output_device_combo.bind('<<ComboboxSelected>>', self.on_output_device_changed)
+        self.output_device_var.trace('w', self.update_selected_devices)
         
         # Verstärkungsfaktor-Einstellung
         row += 1 
@@ -237,6 +292,7 @@ class SimplexRepeater:
         self.gain_label = ttk.Label(gain_frame, text="0.0 dB")
         self.gain_label.pack(side=tk.LEFT, padx=5)
         self.gain_var.trace('w', self.update_gain_label)
+        self.gain_linear = 10.0 ** (self.gain_var.get() / 20.0)
         
         # Status-Anzeige
         row += 1 
@@ -270,45 +326,84 @@ class SimplexRepeater:
                                      state=tk.DISABLED)
         self.stop_button.pack(side=tk.LEFT, padx=5)
         
+        self.refresh_button = ttk.Button(button_frame, text="Geräte aktualisieren",
+                                        command=self.refresh_audio_devices)
+        self.refresh_button.pack(side=tk.LEFT, padx=5)
+        
         # Grid-Konfiguration
         main_frame.columnconfigure(1, weight=1)
         
         # Event-Binding für Canvas-Resize
         self.level_canvas.bind('<Configure>', self.on_canvas_resize)
         
+        # Einstellungen nach Änderungen gesammelt speichern
+        for var in (self.start_threshold_var, self.stop_threshold_var,
+                    self.rise_time_var, self.fall_time_var,
+                    self.record_time_var, self.stop_time_var, self.dead_time_var,
+                    self.gain_var, self.input_device_var, self.output_device_var):
+            var.trace('w', self.schedule_save)
+        
+    # Die Label-Callbacks halten zusätzlich eine Kopie jedes Reglerwerts als Python-Wert,
+    # damit der Audio-Thread und die PortAudio-Callbacks keine Tk-Variablen lesen müssen.
+    # Die Label-Texte selbst werden gesammelt und einmal pro Idle-Durchlauf gesetzt.
+    
+    def set_label_text(self, label, text):
+        """Merkt einen Label-Text vor und plant einen gemeinsamen Idle-Flush"""
+        self.pending_labels[label] = text
+        if not self.label_flush_pending:
+            self.label_flush_pending = True
+            self.root.after_idle(self.flush_label_texts)
+            
+    def flush_label_texts(self):
+        """Setzt alle vorgemerkten Label-Texte (nur den jeweils letzten Wert)"""
+        pending, self.pending_labels = self.pending_labels, {}
+        self.label_flush_pending = False
+        for label, text in pending.items():
+            label.config(text=text)
+    
     def update_threshold_label(self, *args):
-        self.threshold_label.config(text=str(self.start_threshold_var.get()))
+        self.start_threshold = self.start_threshold_var.get()
+        self.set_label_text(self.threshold_label, str(self.start_threshold))
         
     def update_stop_threshold_label(self, *args):
-        self.stop_threshold_label.config(text=str(self.stop_threshold_var.get()))
-        self.update_threshold_lines()
+        self.stop_threshold = self.stop_threshold_var.get()
+        self.set_label_text(self.stop_threshold_label, str(self.stop_threshold))
+        self.schedule_threshold_lines()
         
     def update_stop_time_label(self, *args):
-        self.stop_time_label.config(text=f"{self.stop_time_var.get():.1f}s")
+        self.stop_time = self.stop_time_var.get()
+        self.set_label_text(self.stop_time_label, f"{self.stop_time:.1f}s")
         
     def update_record_time_label(self, *args):
-        self.record_time_label.config(text=f"{self.record_time_var.get():.1f}s")
+        self.record_time = self.record_time_var.get()
+        self.set_label_text(self.record_time_label, f"{self.record_time:.1f}s")
         
     def update_dead_time_label(self, *args):
-        self.dead_time_label.config(text=f"{self.dead_time_var.get():.1f}s")
+        self.dead_time = self.dead_time_var.get()
+        self.set_label_text(self.dead_time_label, f"{self.dead_time:.1f}s")
         
     def update_rise_time_label(self, *args):
         value = self.rise_time_var.get()
+        # Koeffizient nur bei Regleränderung neu berechnen, nicht pro Audio-Block
+        self.rise_coefficient = self.envelope_coefficient(value)
         if value == 0:
-            self.rise_time_label.config(text="Aus")
+            self.set_label_text(self.rise_time_label, "Aus")
         else:
-            self.rise_time_label.config(text=f"{value:.0f} ms")
+            self.set_label_text(self.rise_time_label, f"{value:.0f} ms")
         
     def update_fall_time_label(self, *args):
         value = self.fall_time_var.get()
+        self.fall_coefficient = self.envelope_coefficient(value)
         if value == 0:
-            self.fall_time_label.config(text="Aus")
+            self.set_label_text(self.fall_time_label, "Aus")
         else:
-            self.fall_time_label.config(text=f"{value:.0f} ms")
+            self.set_label_text(self.fall_time_label, f"{value:.0f} ms")
     
     def update_gain_label(self, *args):
         value = self.gain_var.get()
-        self.gain_label.config(text=f"{value:+.1f} dB")
+        # Linearen Faktor nur bei Regleränderung berechnen: gain_linear = 10^(gain_dB / 20)
+        self.gain_linear = 10.0 ** (value / 20.0)
+        self.set_label_text(self.gain_label, f"{value:+.1f} dB")
         
     def on_threshold_change(self, value):
         """Wird aufgerufen wenn sich der Eingangspegel ändert"""
@@ -323,15 +418,36 @@ class SimplexRepeater:
         self.stop_threshold_scale.config(to=start_threshold)
         
         # Aktualisiere Schwellwert-Linien im Canvas
-        self.update_threshold_lines()
+        self.schedule_threshold_lines()
         
     def on_canvas_resize(self, event):
         """Wird aufgerufen wenn Canvas größe ändert"""
+        self.canvas_width = event.width
+        # Tk liefert beim Ziehen viele <Configure>-Events - nur das letzte zählt
+        if self.resize_after_id is not None:
+            self.root.after_cancel(self.resize_after_id)
+        self.resize_after_id = self.root.after(self.RESIZE_DELAY_MS, self.on_canvas_resize_done)
+        
+    def on_canvas_resize_done(self):
+        """Setzt die Schwellwert-Linien nach abgeschlossener Größenänderung"""
+        self.resize_after_id = None
+        self.update_threshold_lines()
+        
+    def schedule_threshold_lines(self):
+        """Plant ein einmaliges Verschieben der Schwellwert-Linien im nächsten Idle-Durchlauf"""
+        # Ein Regler-Tick löst Scale-Command und Variablen-Trace aus - beides wird zusammengefasst
+        if not self.threshold_lines_pending:
+            self.threshold_lines_pending = True
+            self.root.after_idle(self.flush_threshold_lines)
+            
+    def flush_threshold_lines(self):
+        """Führt das geplante Verschieben der Schwellwert-Linien aus"""
+        self.threshold_lines_pending = False
         self.update_threshold_lines()
         
     def update_threshold_lines(self):
         """Aktualisiert die Schwellwert-Linien im Canvas"""
-        canvas_width = self.level_canvas.winfo_width()
+        canvas_width = self.canvas_width
         if canvas_width <= 1:
             return
             
@@ -342,30 +458,31 @@ class SimplexRepeater:
         start_threshold = self.start_threshold_var.get()
         stop_threshold = self.stop_threshold_var.get()
         
+        # Nichts zu tun, wenn sich weder Regler noch Breite geändert haben
+        lines = (start_threshold, stop_threshold, canvas_width)
+        if lines == self.last_threshold_lines:
+            return
+        self.last_threshold_lines = lines
+        
         threshold_x = (start_threshold / max_level) * canvas_width
         stop_threshold_x = (stop_threshold / max_level) * canvas_width
         
-        # Lösche alte Linien
-        if self.threshold_line:
-            self.level_canvas.delete(self.threshold_line)
-        if self.stop_threshold_line:
-            self.level_canvas.delete(self.stop_threshold_line)
-            
-        # Zeichne neue Linien
-        self.stop_threshold_line = self.level_canvas.create_line(
-            stop_threshold_x, 1, stop_threshold_x, canvas_height+1,
-            fill='green', width=4, tags='stop_threshold')
-        self.threshold_line = self.level_canvas.create_line(
-            threshold_x, 1, threshold_x, canvas_height+1,
-            fill='red', width=4, tags='start_threshold')
+        # Linien verschieben
+        self.level_canvas.coords(self.stop_threshold_line,
+                                 stop_threshold_x, 1, stop_threshold_x, canvas_height+1)
+        self.level_canvas.coords(self.threshold_line,
+                                 threshold_x, 1, threshold_x, canvas_height+1)
         
     def load_audio_devices(self):
         """Lädt verfügbare Audio-Geräte"""
+        # Geräteinfos einmalig abfragen
+        device_infos = [self.p.get_device_info_by_index(i)
+                        for i in range(self.p.get_device_count())]
+        
         input_devices = []
         output_devices = []
         
-        for i in range(self.p.get_device_count()):
-            info = self.p.get_device_info_by_index(i)
+        for i, info in enumerate(device_infos):
             name = f"{i}: {info['name']}"
             
             if info['maxInputChannels'] > 0:
@@ -377,90 +494,52 @@ class SimplexRepeater:
         self.input_device_combo['values'] = [name for _, name in input_devices]
         self.output_device_combo['values'] = [name for _, name in output_devices]
         
-        # Standard-Geräte auswählen
-        if input_devices:
-            self.input_device_combo.current(0)
-        if output_devices:
-            self.output_device_combo.current(0)
-            
         # Geräte-IDs speichern
         self.input_devices = {name: idx for idx, name in input_devices}
         self.output_devices = {name: idx for idx, name in output_devices}
         
+        # Bisherige Auswahl beibehalten, sonst Standard-Geräte auswählen
+        if input_devices and self.input_device_var.get() not in self.input_devices:
+            self.input_device_combo.current(0)
+        if output_devices and self.output_device_var.get() not in self.output_devices:
+            self.output_device_combo.current(0)
+        # Geräte-IDs können sich trotz gleicher Auswahl geändert haben
+        self.update_selected_devices()
+    
+    def refresh_audio_devices(self):
+        """Liest die Geräteliste neu ein (nur im gestoppten Zustand)"""
+        if self.running or (self.audio_thread and self.audio_thread.is_alive()):
+            return
+        # PortAudio ermittelt die Geräte nur bei der Initialisierung
+        self.p.terminate()
+        self.p = pyaudio.PyAudio()
+        self.load_audio_devices()
+        
+    def update_selected_devices(self, *args):
+        """Übernimmt die Geräte-IDs der aktuellen Auswahl (läuft im Tk-Thread)"""
+        self.input_device = self.input_devices.get(self.input_device_var.get(), None)
+        self.output_device = self.output_devices.get(self.output_device_var.get(), None)
+        
     def get_selected_input_device(self):
         """Gibt die ausgewählte Eingabe-Geräte-ID zurück"""
-        device_name = self.input_device_var.get()
-        return self.input_devices.get(device_name, None)
+        return self.input_device
         
     def get_selected_output_device(self):
         """Gibt die ausgewählte Ausgabe-Geräte-ID zurück"""
-        device_name = self.output_device_var.get()
-        return self.output_devices.get(device_name, None)
+        return self.output_device
     
     def on_input_device_changed(self, event=None):
         """Wird aufgerufen wenn Eingangsquelle geändert wird"""
         if self.running:
             self.restart_streams_flag = True
+            self.wake_event.set()
     
     def on_output_device_changed(self, event=None):
         """Wird aufgerufen wenn Ausgangsquelle geändert wird"""
         if self.running:
             self.restart_streams_flag = True
+            self.wake_event.set()
     
-    def restart_audio_streams(self):
-        """Trennt alte Streams und öffnet neue mit aktuellen Geräten"""
-        with self.streams_lock:
-            # Alte Streams schließen
-            if self.stream_in:
-                try:
-                    self.stream_in.stop_stream()
-                    self.stream_in.close()
-                except Exception as e:
-                    print(f"Fehler beim Schließen des Input-Streams: {e}")
-                self.stream_in = None
-            
-            if self.stream_out:
-                try:
-                    self.stream_out.stop_stream()
-                    self.stream_out.close()
-                except Exception as e:
-                    print(f"Fehler beim Schließen des Output-Streams: {e}")
-                self.stream_out = None
-            
-            # Neue Streams öffnen
-            input_device = self.get_selected_input_device()
-            output_device = self.get_selected_output_device()
-            
-            if input_device is not None:
-                try:
-                    self.stream_in = self.p.open(
-                        format=self.FORMAT,
-                        channels=self.CHANNELS,
-                        rate=self.RATE,
-                        input=True,
-                        input_device_index=input_device,
-                        frames_per_buffer=self.CHUNK
-                    )
-                except Exception as e:
-                    print(f"Fehler beim Öffnen des Input-Streams: {e}")
-                    self.root.after(0, messagebox.showerror, "Fehler", 
-                                  f"Eingangsquelle konnte nicht geöffnet werden: {str(e)}")
-            
-            if output_device is not None:
-                try:
-                    self.stream_out = self.p.open(
-                        format=self.FORMAT,
-                        channels=self.CHANNELS,
-                        rate=self.RATE,
-                        output=True,
-                        output_device_index=output_device,
-                        frames_per_buffer=self.CHUNK
-                    )
-                except Exception as e:
-                    print(f"Fehler beim Öffnen des Output-Streams: {e}")
-                    self.root.after(0, messagebox.showerror, "Fehler", 
-                                  f"Ausgangsquelle konnte nicht geöffnet werden: {str(e)}")
-        
     def start_repeater(self):
         """Startet den Repeater"""
         input_device = self.get_selected_input_device()
@@ -471,8 +550,10 @@ class SimplexRepeater:
             return
             
         self.running = True
+        self.stop_event.clear()
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
+        self.refresh_button.config(state=tk.DISABLED)
         self.update_status("Bereit - Warte auf Signal...", 'green')
         
         # Audio-Thread starten
@@ -482,51 +563,76 @@ class SimplexRepeater:
     def stop_repeater(self):
         """Stoppt den Repeater"""
         self.running = False
+        self.wake_event.set()
+        self.stop_event.set()
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
+        self.refresh_button.config(state=tk.NORMAL)
         self.update_status("Gestoppt", 'red')
-        self.progress['value'] = 0
+        self.current_progress = 0.0
         # Konfiguration speichern
         self.save_config()
         
     def update_status(self, text, color='black'):
-        """Aktualisiert den Status"""
+        """Aktualisiert den Status (nur im Tk-Thread)"""
+        self.current_status = self.last_status = (text, color)
         self.status_label.config(text=text, foreground=color)
         
-    def update_level(self, level):
-        """Aktualisiert die Pegel-Anzeige mit Attack/Release-Dämpfung"""
-        current_time = time.time()
-        time_elapsed = current_time - self.last_update_time
-        self.last_update_time = current_time
-        
-        # Dämpfungsparameter
-        rise_time_ms = self.rise_time_var.get()
-        fall_time_ms = self.fall_time_var.get()
-        
-        # Berechne gedämpften Pegel
-        if level > self.current_damped_level:
-            # Anstieg
-            if rise_time_ms == 0:
-                # Keine Dämpfung: Sofortige Anpassung
-                self.current_damped_level = level
-            else:
-                # Dämpfung anwenden
-                # Berechne maximale Änderung basierend auf Zeit und Dämpfung
-                # Je höher rise_time_ms, desto langsamer der Anstieg
-                max_change = (level - self.current_damped_level) * (time_elapsed * 1000 / rise_time_ms)
-                self.current_damped_level = min(self.current_damped_level + max_change, level)
-        else:
-            # Abfall
-            if fall_time_ms == 0:
-                # Keine Dämpfung: Sofortige Anpassung
-                self.current_damped_level = level
-            else:
-                # Dämpfung anwenden
-                max_change = (self.current_damped_level - level) * (time_elapsed * 1000 / fall_time_ms)
-                self.current_damped_level = max(self.current_damped_level - max_change, level)
+    def post_status(self, text, color='black'):
+        """Setzt den Status aus dem Audio-Thread, angezeigt beim nächsten Refresh"""
+        self.current_status = (text, color)
+        
+    def show_posted_status(self):
+        """Übernimmt den zuletzt gesetzten Status in die Anzeige, falls er sich geändert hat"""
+        # Im gestoppten Zustand gilt nur der Status aus dem Tk-Thread ("Gestoppt"/"Beende...").
+        # Die Prüfung läuft wie stop_repeater im Tk-Thread, ein nachlaufender Audio-Thread
+        # kann den Status daher nicht mehr überschreiben.
+        if not self.running:
+            return
+        status = self.current_status
+        if status is not None and status != self.last_status:
+            self.last_status = status
+            self.status_label.config(text=status[0], foreground=status[1])
         
+    def update_level(self, level):
+        """Aktualisiert den gedämpften Pegel (Audio-Thread) und gibt ihn zurück"""
+        return self.update_levels((level,))[0]
+        
+    def update_levels(self, levels):
+        """Führt die Hüllkurve über mehrere Blockpegel und gibt die gedämpften Pegel zurück"""
+        # Einpoliger IIR-Hüllkurvenfolger: v = a*v + (1-a)*x, getrennt für Anstieg/Abfall
+        # Je höher die Dämpfungszeit, desto näher liegt a an 1 und desto träger der Pegel
+        rise_coefficient = self.rise_coefficient
+        fall_coefficient = self.fall_coefficient
+        damped_level = self.current_damped_level
+        damped_levels = []
+        for level in levels:
+            alpha = rise_coefficient if level > damped_level else fall_coefficient
+            damped_level = alpha * damped_level + (1.0 - alpha) * level
+            damped_levels.append(damped_level)
+        self.current_damped_level = damped_level
+        return damped_levels
+        
+    def envelope_coefficient(self, time_ms):
+        """Berechnet den Glättungskoeffizienten für eine Dämpfungszeit in ms (0 = aus)"""
+        if time_ms <= 0:
+            return 0.0
+        chunk_ms = self.CHUNK / self.RATE * 1000
+        return math.exp(-chunk_ms / time_ms)
+        
+    def refresh_display(self):
+        """Zeichnet Pegel, Fortschritt und Status im festen Takt neu (läuft im Tk-Thread)"""
+        # Der Audio-Thread schreibt nur current_damped_level, current_progress und
+        # current_status, alle Tk-Aufrufe bleiben hier (der jeweils letzte Wert gewinnt)
+        self.draw_level()
+        self.update_progress()
+        self.show_posted_status()
+        self.root.after(int(self.GUI_UPDATE_INTERVAL * 1000), self.refresh_display)
+        
+    def draw_level(self):
+        """Zeichnet den aktuellen gedämpften Pegel in die Pegelanzeige"""
         # Canvas-Darstellung
-        canvas_width = self.level_canvas.winfo_width()
+        canvas_width = self.canvas_width
         if canvas_width <= 1:
             return
             
@@ -537,18 +643,36 @@ class SimplexRepeater:
         bar_width = (self.current_damped_level / max_level) * canvas_width
         bar_width = min(bar_width, canvas_width)  # Nicht über Canvas hinaus
         
-        # Lösche alten Balken
-        if self.level_bar:
-            self.level_canvas.delete(self.level_bar)
-            
-        # Zeichne neuen Balken
-        self.level_bar = self.level_canvas.create_rectangle(
-            0, 0, bar_width, canvas_height,
-            fill='lightgray', outline='', tags='level')
-        
-        # Schwellwert-Linien in den Vordergrund
-        self.level_canvas.tag_raise('start_threshold')
-        self.level_canvas.tag_raise('stop_threshold')
+        # Balken nur verschieben, wenn sich die Breite um mindestens ein Pixel ändert
+        bar_px = int(bar_width)
+        if bar_px == self.last_bar_px:
+            return
+        self.last_bar_px = bar_px
+        self.level_canvas.coords(self.level_bar, 0, 0, bar_px, canvas_height)
+        
+    def calculate_level(self, audio_data):
+        """Berechnet den RMS-Pegel eines int16-Blocks in einem Durchlauf"""
+        # float32 hält die Quadratsumme eines Blocks ohne Überlauf (max. ~1e12)
+        samples = self._level_buf[0, :len(audio_data)]
+        np.copyto(samples, audio_data)
+        return float(np.sqrt(np.dot(samples, samples) / len(samples)))
+        
+    def calculate_levels(self, blocks):
+        """Berechnet die RMS-Pegel mehrerer Blöcke (eine Zeile pro Block) auf einmal"""
+        samples = self._level_buf[:len(blocks)]
+        np.copyto(samples, blocks)
+        return np.sqrt(np.einsum('ij,ij->i', samples, samples) / blocks.shape[1])
+        
+    def monitoring_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio-Callback des Monitoring-Streams: Pegel messen und Trigger melden"""
+        audio_data = np.frombuffer(in_data, dtype=np.int16)
+        self.update_level(self.calculate_level(audio_data))
+        
+        # Prüfe ob Aufnahme getriggert werden soll
+        if self.current_damped_level > self.start_threshold:
+            self.trigger_event.set()
+            return (None, pyaudio.paComplete)
+        return (None, pyaudio.paContinue)
         
     def audio_loop(self):
         """Haupt-Audio-Schleife - Monitoring ohne permanente Streams"""
@@ -565,6 +689,8 @@ class SimplexRepeater:
             monitoring_stream = None
             
             while self.running:
+                self.wake_event.clear()
+                
                 # Prüfe ob Streams neu gestartet werden müssen (Geräteänderung)
                 if self.restart_streams_flag:
                     self.restart_streams_flag = False
@@ -576,10 +702,10 @@ class SimplexRepeater:
                             pass
                         monitoring_stream = None
                     input_device = self.get_selected_input_device()
-                    self.root.after(0, self.update_status, "Bereit - Warte auf Signal...", 'green')
+                    self.post_status("Bereit - Warte auf Signal...", 'green')
                 
                 # Prüfe ob wir in Totzeit sind
-                current_time = time.time()
+                current_time = time.monotonic()
                 if current_time < self.dead_time_end:
                     # In Totzeit - kein Monitoring-Stream
                     if monitoring_stream:
@@ -591,13 +717,14 @@ class SimplexRepeater:
                         monitoring_stream = None
                     
                     remaining = self.dead_time_end - current_time
-                    self.root.after(0, self.update_status, 
-                                  f"Totzeit: {remaining:.1f}s verbleibend", 'orange')
-                    time.sleep(0.1)
+                    self.post_status(f"Totzeit: {remaining:.1f}s verbleibend", 'orange')
+                    # Unterbrechbar warten: Stop oder Geräteänderung wecken sofort auf
+                    self.wake_event.wait(timeout=min(0.1, remaining))
                     continue
                 
                 # Außerhalb Totzeit - Monitoring-Stream öffnen falls nötig
                 if not monitoring_stream and not self.is_recording and not self.is_playing:
+                    self.trigger_event.clear()
                     try:
                         monitoring_stream = self.p.open(
                             format=self.FORMAT,
@@ -605,39 +732,26 @@ class SimplexRepeater:
                             rate=self.RATE,
                             input=True,
                             input_device_index=input_device,
-                            frames_per_buffer=self.CHUNK
+                            frames_per_buffer=self.CHUNK,
+                            stream_callback=self.monitoring_callback
                         )
-                    except Exception as e:
-                        print(f"Fehler beim Öffnen des Monitoring-Streams: {e}")
-                        time.sleep(0.5)
+                    except Exception:
+                        logger.exception("Fehler beim Öffnen des Monitoring-Streams")
+                        self.wake_event.wait(timeout=0.5)
                         continue
                 
-                # Pegel überwachen
-                if monitoring_stream and not self.is_recording and not self.is_playing:
+                # Auf Trigger aus dem Monitoring-Callback warten
+                if self.trigger_event.wait(timeout=0.1):
+                    # Monitoring-Stream schließen vor Aufnahme
                     try:
-                        data = monitoring_stream.read(self.CHUNK, exception_on_overflow=False)
-                        audio_data = np.frombuffer(data, dtype=np.int16)
-                        level = np.abs(audio_data).mean()
-                        self.root.after(0, self.update_level, level)
-                        
-                        # Prüfe ob Aufnahme getriggert werden soll
-                        if self.current_damped_level > self.start_threshold_var.get():
-                            # Monitoring-Stream schließen vor Aufnahme
-                            try:
-                                monitoring_stream.stop_stream()
-                                monitoring_stream.close()
-                            except:
-                                pass
-                            monitoring_stream = None
-                            
-                            # Starte Aufnahme
-                            self.start_recording()
-                            
-                    except Exception as e:
-                        print(f"Fehler beim Monitoring: {e}")
-                        time.sleep(0.01)
-                else:
-                    time.sleep(0.01)
+                        monitoring_stream.stop_stream()
+                        monitoring_stream.close()
+                    except:
+                        pass
+                    monitoring_stream = None
+                    
+                    # Starte Aufnahme
+                    self.start_recording()
             
             # Aufräumen
             if monitoring_stream:
@@ -655,8 +769,8 @@ class SimplexRepeater:
     def start_recording(self):
         """Startet die Aufnahme - öffnet eigenen Stream"""
         self.is_recording = True
-        self.audio_buffer.clear()
-        self.root.after(0, self.update_status, "Aufnahme läuft...", 'orange')
+        self.audio_buffer_len = 0
+        self.post_status("Aufnahme läuft...", 'orange')
         
         input_device = self.get_selected_input_device()
         if input_device is None:
@@ -672,47 +786,64 @@ class SimplexRepeater:
                 rate=self.RATE,
                 input=True,
                 input_device_index=input_device,
-                frames_per_buffer=self.CHUNK
+                frames_per_buffer=self.CHUNK * self.READ_CHUNKS
             )
             
-            record_time = self.record_time_var.get()
-            chunks_to_record = int(self.RATE / self.CHUNK * record_time)
+            # Alle Einstellungen und Attribute vor der Schleife in lokale Namen übernehmen
+            chunk = self.CHUNK
+            read_frames = chunk * self.READ_CHUNKS
+            chunks_to_record = int(self.RATE / chunk * self.record_time)
+            self.ensure_audio_buffer_capacity(chunks_to_record * chunk)
+            audio_buffer = self.audio_buffer
             
-            stop_threshold = self.stop_threshold_var.get()
-            stop_time = self.stop_time_var.get()
-            chunks_for_stop = int(self.RATE / self.CHUNK * stop_time)
+            stop_threshold = float(self.stop_threshold)
+            chunks_for_stop = int(self.RATE / chunk * self.stop_time)
+            progress_step = 100.0 / chunks_to_record if chunks_to_record else 0.0
             low_level_counter = 0
             
-            # Aufnahme
+            calculate_levels = self.calculate_levels
+            update_levels = self.update_levels
+            
+            # Aufnahme: mehrere Blöcke pro Lesezugriff, Auswertung weiterhin pro Block
             chunk_count = 0
-            for _ in range(chunks_to_record):
-                if not self.running:
-                    break
+            recording_done = False
+            while chunk_count < chunks_to_record and self.running and not recording_done:
                 try:
-                    data = record_stream.read(self.CHUNK, exception_on_overflow=False)
+                    data = record_stream.read(read_frames, exception_on_overflow=False)
+                    block = np.frombuffer(data, dtype=np.int16).reshape(-1, chunk)
                     
-                    self.audio_buffer.append(data)
-                    chunk_count += 1
+                    # Pegel und Hüllkurve aller Blöcke mit je einem Aufruf berechnen
+                    damped_levels = update_levels(calculate_levels(block).tolist())
                     
-                    # Fortschritt aktualisieren
-                    progress_percent = (chunk_count / chunks_to_record) * 100
-                    self.root.after(0, self.update_progress, progress_percent)
+                    # Abbruchprüfung zählt Blöcke über Lesezugriffe hinweg
+                    accepted = 0
+                    for damped_level in damped_levels:
+                        accepted += 1
+                        
+                        # Prüfe ob gedämpfter Pegel unter Abbruch-Pegel
+                        if damped_level < stop_threshold:
+                            low_level_counter += 1
+                            if low_level_counter >= chunks_for_stop:
+                                recording_done = True
+                                break
+                        else:
+                            low_level_counter = 0
+                        
+                        if chunk_count + accepted >= chunks_to_record:
+                            break
                     
-                    # Pegel aktualisieren
-                    audio_data = np.frombuffer(data, dtype=np.int16)
-                    level = np.abs(audio_data).mean()
-                    self.root.after(0, self.update_level, level)
+                    # Angenommene Blöcke mit einer Slice-Zuweisung in den Puffer kopieren
+                    start = self.audio_buffer_len
+                    end = min(start + accepted * chunk, len(audio_buffer))
+                    audio_buffer[start:end] = block[:accepted].reshape(-1)[:end - start]
+                    self.audio_buffer_len = end
+                    chunk_count += accepted
                     
-                    # Prüfe ob gedämpfter Pegel unter Abbruch-Pegel
-                    if self.current_damped_level < stop_threshold:
-                        low_level_counter += 1
-                        if low_level_counter >= chunks_for_stop:
-                            break
-                    else:
-                        low_level_counter = 0
-                        
-                except Exception as e:
-                    print(f"Fehler bei Aufnahme: {e}")
+                    # Fortschritt aktualisieren
+                    self.current_progress = chunk_count * progress_step
+                    
+                except Exception:
+                    logger.exception("Fehler bei Aufnahme")
                     break
             
         finally:
@@ -727,77 +858,97 @@ class SimplexRepeater:
             self.is_recording = False
         
         # Sofort abspielen
-        if self.running and len(self.audio_buffer) > 0:
+        if self.running and self.audio_buffer_len > 0:
             self.play_audio()
             
-        self.root.after(0, self.update_progress, 0)
-        self.root.after(0, self.update_status, "Bereit - Warte auf Signal...", 'green')
-        
-    def apply_gain(self, data):
-        """Wendet Verstärkung auf Audio-Daten an"""
-        gain_db = self.gain_var.get()
-        
-        # Wenn Verstärkung 0 dB ist, gib Originaldaten zurück
-        if gain_db == 0.0:
-            return data
-        
-        # Konvertiere dB zu linearem Faktor: gain_linear = 10^(gain_dB / 20)
-        gain_linear = 10.0 ** (gain_db / 20.0)
-        
-        # Konvertiere Bytes zu numpy Array
-        audio_data = np.frombuffer(data, dtype=np.int16).astype(np.float32)
-        
-        # Wende Verstärkung an
-        audio_data *= gain_linear
+        self.current_progress = 0.0
+        self.post_status("Bereit - Warte auf Signal...", 'green')
         
-        # Clipping vermeiden (begrenze auf int16 Bereich)
-        audio_data = np.clip(audio_data, -32768, 32767)
-        
-        # Zurück zu int16 konvertieren
-        return audio_data.astype(np.int16).tobytes()
+    def ensure_audio_buffer_capacity(self, samples):
+        """Vergrößert den Aufnahmepuffer bei Bedarf (Verdopplung), verkleinert ihn nie"""
+        capacity = len(self.audio_buffer)
+        if capacity >= samples:
+            return
+        # Vor einer Aufnahme ist der Puffer leer, daher muss nichts umkopiert werden
+        self.audio_buffer = np.zeros(max(samples, 2 * capacity), dtype=np.int16)
+        
+    def apply_gain(self, audio_data, gain_linear, out=None):
+        """Wendet einen linearen Verstärkungsfaktor auf int16-Daten an und liefert int16 zurück"""
+        # Ohne Verstärkung Originaldaten ohne Kopie zurückgeben
+        # (PyAudio akzeptiert zusammenhängende ndarrays direkt als Puffer)
+        if gain_linear == 1.0 and out is None:
+            return audio_data
+        if out is None:
+            out = np.empty_like(audio_data)
+        
+        # Blockweise über den wiederverwendeten float32-Puffer: keine Temporärarrays
+        # in Aufnahmegröße, der Block bleibt im Cache
+        work_buf = self._gain_buf
+        step = len(work_buf)
+        for start in range(0, len(audio_data), step):
+            block = audio_data[start:start + step]
+            work = work_buf[:len(block)]
+            np.multiply(block, gain_linear, out=work, dtype=np.float32)
+            # Clipping vermeiden (begrenze auf int16 Bereich)
+            np.clip(work, -32768, 32767, out=work)
+            out[start:start + len(block)] = work
+        
+        return out
+    
+    def playback_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio-Callback der Wiedergabe: liefert den nächsten Abschnitt der Aufnahme"""
+        start = self.playback_position
+        end = min(start + frame_count, self.playback_length)
+        self.playback_position = end
+        
+        data = self.audio_buffer[start:end]
+        if end >= self.playback_length:
+            # Letzter Abschnitt: PyAudio füllt den Rest des Puffers mit Stille auf
+            return (data, pyaudio.paComplete)
+        return (data, pyaudio.paContinue)
     
     def play_audio(self):
         """Spielt aufgenommenes Audio ab - öffnet eigenen Stream"""
         self.is_playing = True
-        self.root.after(0, self.update_status, "Wiedergabe läuft...", 'blue')
+        self.post_status("Wiedergabe läuft...", 'blue')
         
         output_device = self.get_selected_output_device()
         if output_device is None:
             self.is_playing = False
-            self.audio_buffer.clear()
             return
         
         playback_stream = None
         try:
-            # Stream für Wiedergabe öffnen
+            # Wiedergabe-Zustand für den Callback vorbereiten (kein Tk-Zugriff im Callback)
+            self.playback_position = 0
+            self.playback_length = self.audio_buffer_len
+            
+            # Verstärkung einmalig auf die gesamte Aufnahme anwenden, der Callback
+            # liefert danach nur noch Ausschnitte des fertigen Puffers
+            gain_linear = self.gain_linear
+            if gain_linear != 1.0:
+                recording = self.audio_buffer[:self.playback_length]
+                self.apply_gain(recording, gain_linear, out=recording)
+            
+            # Stream für Wiedergabe im Callback-Modus öffnen, PortAudio holt sich die Daten selbst
             playback_stream = self.p.open(
                 format=self.FORMAT,
                 channels=self.CHANNELS,
                 rate=self.RATE,
                 output=True,
                 output_device_index=output_device,
-                frames_per_buffer=self.CHUNK
+                frames_per_buffer=self.CHUNK * self.WRITE_CHUNKS,
+                stream_callback=self.playback_callback
             )
             
-            # Audio abspielen
-            total_chunks = len(self.audio_buffer)
-            played_chunks = 0
-            
-            while self.audio_buffer and self.running:
-                data = self.audio_buffer.popleft()
-                
-                # Verstärkung anwenden
-                data = self.apply_gain(data)
-                
-                playback_stream.write(data)
-                played_chunks += 1
-                
-                # Fortschritt aktualisieren (rückwärts von 100 zu 0)
-                progress_percent = 100 - ((played_chunks / total_chunks) * 100)
-                self.root.after(0, self.update_progress, progress_percent)
+            # Bis zum Ende der Wiedergabe nur den Fortschritt anzeigen (rückwärts von 100 zu 0)
+            progress_step = 100.0 / self.playback_length
+            while playback_stream.is_active() and self.running:
+                self.current_progress = 100.0 - self.playback_position * progress_step
+                self.stop_event.wait(timeout=self.GUI_UPDATE_INTERVAL)
             
-        except Exception as e:
-            print(f"Fehler bei Wiedergabe: {e}")
+        except Exception:
+            logger.exception("Fehler bei Wiedergabe")
         
         finally:
             # Stream schließen
@@ -809,15 +960,16 @@ class SimplexRepeater:
                     pass
             
             self.is_playing = False
-            self.audio_buffer.clear()
         
         # Totzeit setzen
-        dead_time = self.dead_time_var.get()
-        self.dead_time_end = time.time() + dead_time
-        
-    def update_progress(self, value):
-        """Aktualisiert den Fortschrittsbalken"""
-        self.progress['value'] = value
+        self.dead_time_end = time.monotonic() + self.dead_time
+        
+    def update_progress(self):
+        """Aktualisiert den Fortschrittsbalken, falls sich der Wert geändert hat"""
+        value = self.current_progress
+        if value != self.last_progress:
+            self.last_progress = value
+            self.progress['value'] = value
     
     def load_config(self):
         """Lädt Konfiguration aus Datei"""
@@ -825,6 +977,8 @@ class SimplexRepeater:
             try:
                 with open(self.config_file, 'r') as f:
                     config = json.load(f)
+                # Dateiinhalt merken: unveränderte Einstellungen werden nicht erneut geschrieben
+                self.last_saved_config = dict(config)
                     
                 # Werte aus Konfiguration setzen
                 self.start_threshold_var.set(config.get('start_threshold', 1000))
@@ -845,8 +999,8 @@ class SimplexRepeater:
                 if output_device and output_device in self.output_devices:
                     self.output_device_var.set(output_device)
                     
-            except Exception as e:
-                print(f"Fehler beim Laden der Konfiguration: {e}")
+            except Exception:
+                logger.exception("Fehler beim Laden der Konfiguration")
         
         # Aktualisiere Schwellwert-Grenzen nach dem Laden der Konfiguration
         start_threshold = self.start_threshold_var.get()
@@ -862,8 +1016,20 @@ class SimplexRepeater:
         # Zeichne Schwellwert-Linien
         self.update_threshold_lines()
     
+    def schedule_save(self, *args):
+        """Plant das Speichern der Konfiguration; schnelle Änderungen werden zusammengefasst"""
+        if self.save_pending:
+            return
+        self.save_pending = True
+        self.root.after(self.SAVE_DELAY_MS, self.save_scheduled_config)
+        
+    def save_scheduled_config(self):
+        """Führt ein geplantes Speichern aus"""
+        self.save_pending = False
+        self.save_config()
+    
     def save_config(self):
-        """Speichert Konfiguration in Datei"""
+        """Speichert Konfiguration in Datei (nur wenn sich etwas geändert hat)"""
         try:
             config = {
                 'start_threshold': self.start_threshold_var.get(),
@@ -878,26 +1044,54 @@ class SimplexRepeater:
                 'output_device': self.output_device_var.get()
             }
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            if config == self.last_saved_config:
+                return
+            
+            # Atomar schreiben: erst temporäre Datei, dann umbenennen
+            tmp_file = self.config_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(config, f, separators=(',', ':'))
+            os.replace(tmp_file, self.config_file)
+            self.last_saved_config = config
                 
-        except Exception as e:
-            print(f"Fehler beim Speichern der Konfiguration: {e}")
+        except Exception:
+            logger.exception("Fehler beim Speichern der Konfiguration")
         
-    def cleanup(self):
-        """Aufräumen beim Schließen"""
+    def request_shutdown(self):
+        """Handler für das Schließen des Fensters - stößt das Beenden an, ohne zu blockieren"""
+        if self.shutdown_deadline is not None:
+            return  # Beenden läuft bereits
         self.running = False
-        if self.audio_thread and self.audio_thread.is_alive():
-            self.audio_thread.join(timeout=1.0)
+        self.wake_event.set()
+        self.stop_event.set()
+        self.start_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.DISABLED)
+        self.refresh_button.config(state=tk.DISABLED)
+        self.update_status("Beende...", 'red')
+        self.shutdown_deadline = time.monotonic() + 1.0
+        self.poll_shutdown()
+        
+    def poll_shutdown(self):
+        """Prüft per Tk-Timer, ob der Audio-Thread beendet ist, und plant dann das Aufräumen"""
+        if (self.audio_thread and self.audio_thread.is_alive()
+                and time.monotonic() < self.shutdown_deadline):
+            self.root.after(50, self.poll_shutdown)
+            return
+        self.root.after_idle(self.cleanup)
+        
+    def cleanup(self):
+        """Aufräumen beim Schließen, nachdem der Audio-Thread beendet ist"""
         # Konfiguration speichern beim Beenden
         self.save_config()
         self.p.terminate()
+        self.root.destroy()
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     root = tk.Tk()
     app = SimplexRepeater(root)
-    root.protocol("WM_DELETE_WINDOW", lambda: [app.cleanup(), root.destroy()])
+    root.protocol("WM_DELETE_WINDOW", app.request_shutdown)
     root.mainloop()
 
 